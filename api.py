@@ -1,8 +1,11 @@
 import logging
+from contextlib import asynccontextmanager
 from typing import List
 
+import orjson
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from network import Network
@@ -18,15 +21,46 @@ class API:
     def __init__(self, network: Network):
         self.logger = logging.getLogger(__name__)
         self.network = network
-        self.app = FastAPI()
+        self.app = FastAPI(default_response_class=ORJSONResponse, lifespan=self._lifespan)
+
+        # Pre-serialized response bodies: the topology never changes while serving, and
+        # the devices body is rebuilt only when a manual text is reloaded from disk
+        self._topology_body = orjson.dumps(self.network.topology)
+        # (manuals_version, body), replaced as a single tuple so concurrent requests never see a mismatched pair
+        self._devices_cache = None
+
         self._setup_routes()
         self.router = Router()
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        self._preload_manuals()
+        yield
+
+    def _devices_body(self) -> bytes:
+        """Serialized device list, rebuilt only when the manuals have changed since the cached copy."""
+        # Read the version before the devices, so a reload in between leaves the cache stale rather than wrong
+        version = self.network.manual_processor.manuals_version
+        devices = self.network.get_devices()
+        cache = self._devices_cache
+        if cache is None or cache[0] != version:
+            cache = (version, orjson.dumps(devices))
+            self._devices_cache = cache
+        return cache[1]
+
+    def _preload_manuals(self):
+        """Warm the manual text cache and the serialized devices body, so the first /devices request is served from memory."""
+        body = self._devices_body()
+        self.logger.info(f"Preloaded manuals, devices body is {len(body)} bytes")
+
     def _setup_routes(self):
         self.logger.info("Setting up API routes...")
 
+        # Handlers that only touch in-memory state are declared async so they run
+        # directly on the event loop; those doing disk I/O or CPU-heavy routing
+        # stay sync and are dispatched to the threadpool by FastAPI.
         @self.app.get("/")
-        def get_api_info():
+        async def get_api_info():
             """Get API information."""
             self.logger.debug("API info endpoint accessed")
             return {
@@ -36,11 +70,11 @@ class API:
 
         @self.app.get("/devices")
         def get_network_devices():
-            return self.network.get_devices()
+            return Response(content=self._devices_body(), media_type="application/json")
 
         @self.app.get("/network_topology")
-        def get_network():
-            return self.network.topology
+        async def get_network():
+            return Response(content=self._topology_body, media_type="application/json")
 
         @self.app.post("/route")
         def get_network(constraint_devices: DeviceConstraints = None):
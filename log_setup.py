@@ -0,0 +1,39 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def setup_logging() -> QueueListener:
+    """
+    Configure the root logger of the main process.
+
+    Log records are only enqueued by the calling thread; a background listener
+    formats them and writes to stdout (instead of stderr).
+    """
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, handler)
+
+    # The QueueHandler gets no formatter of its own (basicConfig would add one),
+    # so records are formatted only once, by the listener's handler
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def init_worker_logging():
+    """
+    Initializer for worker processes: the queue listener only runs in the main
+    process, so workers write their records to stdout directly.
+    """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, stream=sys.stdout, force=True)
@@ -1,11 +1,21 @@
 import json
 import logging
+import multiprocessing
+import os
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
+import threading
 import time
 import urllib3
+from log_setup import init_worker_logging
 from pdf_extractor import PDFExtractor
 from text_postprocessor import TextPostProcessor
 
@@ -13,9 +23,35 @@ DOWNLOAD_DIR = './generated/downloads'
 EXTRACTED_DIR = './generated/extracted_text'
 OUTPUT_DIR = './generated/processed_text'
 
+MAX_DOWNLOAD_WORKERS = 8
+MAX_DOWNLOADS_PER_HOST = 2
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Written next to the extracted text when a manual cannot be downloaded or extracted
+FAILURE_MARKER_SUFFIX = '.failed'
+
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
+def _sanitize_filename(filename: str) -> str:
+    return filename.translate(_SANITIZE_TABLE)[:200]  # Limit length
+
+
+@lru_cache(maxsize=4096)
+def _safe_name(maker: str, name: str) -> str:
+    return f"{_sanitize_filename(maker)}_{_sanitize_filename(name)}"
+
+
 class ManualProcessor:
     def __init__(self, devices: List[Dict]):
-        self.pdf_extractor = PDFExtractor()
+        # One process pool, shared by all download threads, running PDFium (one instance per process, so
+        # extractions do not serialize on a lock) and splitting the pages of large PDFs for the fallbacks.
+        # Workers are spawned (not forked) since this process runs threads, and only on first use.
+        page_workers = os.cpu_count() or 1
+        self._page_pool = ProcessPoolExecutor(max_workers=page_workers,
+                                              mp_context=multiprocessing.get_context('spawn'),
+                                              initializer=init_worker_logging)
+        self.pdf_extractor = PDFExtractor(executor=self._page_pool, max_workers=page_workers)
 
         # Create the directories if they do not exist
         Path(DOWNLOAD_DIR).mkdir(parents=True, exist_ok=True)
@@ -36,6 +72,15 @@ class ManualProcessor:
             'Upgrade-Insecure-Requests': '1'
         })
 
+        # Reuse pooled connections across the batch and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=MAX_DOWNLOAD_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
         # Disable SSL verification
         self.session.verify = False
         # Disable SSL warnings
@@ -44,8 +89,23 @@ class ManualProcessor:
         # Devices data
         self.devices = devices
 
+        # Processed manual text cache, keyed on (path, st_mtime_ns)
+        self._manual_cache: Dict[str, tuple] = {}
+        self._manual_cache_lock = threading.Lock()
+        self._manual_read_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        # Bumped whenever a manual is (re)read from disk, so callers can cache derived data
+        self.manuals_version = 0
+
+        # Per-host download slots, to stay polite while downloading in parallel
+        self._host_slots = defaultdict(lambda: threading.Semaphore(MAX_DOWNLOADS_PER_HOST))
+        self._host_slots_lock = threading.Lock()
+
         # Download and extract manuals data if it does not already exist
-        if not self._extract_manuals_data():
+        try:
+            extracted = self._extract_manuals_data()
+        finally:
+            self._page_pool.shutdown()
+        if not extracted:
             self.logger.error("Failed to extract manuals data. Exiting.")
             raise RuntimeError("Manuals extraction failed")
 
@@ -60,24 +120,46 @@ class ManualProcessor:
         manual_name = self.get_manual_safe_name(device)
         manual_path = Path(OUTPUT_DIR) / f"{manual_name}.txt"
 
-        # Get the content of the manual if it exists
-        if manual_path.exists():
+        try:
+            mtime_ns = manual_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.logger.warning(f"Manual file not found: {manual_path}")
+            with self._manual_cache_lock:
+                if self._manual_cache.pop(str(manual_path), None) is not None:
+                    self.manuals_version += 1
+            return None
+
+        # Serve from the cache if the file did not change since it was read
+        key = str(manual_path)
+        with self._manual_cache_lock:
+            cached = self._manual_cache.get(key)
+            read_lock = self._manual_read_locks[key]
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        # Only one thread reads a given manual; concurrent callers wait and reuse its result
+        with read_lock:
+            with self._manual_cache_lock:
+                cached = self._manual_cache.get(key)
+            if cached and cached[0] == mtime_ns:
+                return cached[1]
+
+            # Get the content of the manual
             try:
                 with open(manual_path, 'r', encoding='utf-8') as f:
-                    return f.read()
+                    text = f.read()
             except Exception as e:
                 self.logger.error(f"Failed to read manual {manual_name}: {e}")
                 return None
-        else:
-            self.logger.warning(f"Manual file not found: {manual_path}")
-            return None
+
+            with self._manual_cache_lock:
+                self._manual_cache[key] = (mtime_ns, text)
+                self.manuals_version += 1
+        return text
 
     def sanitize_filename(self, filename: str) -> str:
         """Clean filename for safe filesystem storage."""
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename[:200]  # Limit length
+        return _sanitize_filename(filename)
 
 
 
@@ -97,10 +179,14 @@ class ManualProcessor:
             self._download_with_ssl_context
         ]
 
+        with self._host_slots_lock:
+            host_slot = self._host_slots[urlparse(url).netloc]
+
         for i, strategy in enumerate(strategies, 1):
             try:
                 self.logger.info(f"Downloading (attempt {i}): {url}")
-                result = strategy(url, file_path)
+                with host_slot:
+                    result = strategy(url, file_path)
                 if result:
                     self.logger.info(f"Downloaded successfully: {filename}")
                     return str(file_path)
@@ -139,35 +225,25 @@ class ManualProcessor:
         req.add_header('Accept', 'application/pdf,*/*')
 
         with urllib.request.urlopen(req, timeout=30) as response:
-            with open(file_path, 'wb') as f:
-                while True:
-                    chunk = response.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
+            with open(file_path, 'wb', buffering=COPY_BUFFER_SIZE) as f:
+                shutil.copyfileobj(response, f, length=COPY_BUFFER_SIZE)
 
         return file_path.exists() and file_path.stat().st_size > 0
 
 
     def _save_response_to_file(self, response: requests.Response, file_path: Path) -> bool:
-        """Save HTTP response to file with progress tracking."""
+        """Save HTTP response to file."""
         # Check if it's actually a PDF
         content_type = response.headers.get('content-type', '')
         if 'pdf' not in content_type.lower() and 'octet-stream' not in content_type.lower():
             self.logger.warning(f"Content type may not be PDF: {content_type}")
 
-        # Download with progress
+        # Copy the raw stream in large chunks, letting urllib3 undo any gzip/deflate encoding
         total_size = int(response.headers.get('content-length', 0))
-        with open(file_path, 'wb') as f:
-            downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        print(f"\rProgress: {progress:.1f}%", end='', flush=True)
-            print()  # New line
+        self.logger.info(f"Saving {total_size:,} bytes to {file_path}" if total_size else f"Saving to {file_path}")
+        response.raw.decode_content = True
+        with open(file_path, 'wb', buffering=COPY_BUFFER_SIZE) as f:
+            shutil.copyfileobj(response.raw, f, length=COPY_BUFFER_SIZE)
 
         return file_path.exists() and file_path.stat().st_size > 0
 
@@ -178,8 +254,7 @@ class ManualProcessor:
         maker = manual_data.get('maker', 'Unknown')
 
         # Sanitize and create a safe filename
-        safe_name = f"{self.sanitize_filename(maker)}_{self.sanitize_filename(name)}"
-        return safe_name
+        return _safe_name(maker, name)
 
 
     def process_manual(self, manual_data: Dict) -> Dict:
@@ -198,6 +273,7 @@ class ManualProcessor:
             'url': url,
             'status': 'pending',
             'text': '',
+            'char_count': 0,
             'error': None
         }
 
@@ -215,12 +291,51 @@ class ManualProcessor:
 
         safe_name = self.get_manual_safe_name(manual_data)
 
+        # Skip download and extraction if the text for this manual is already on disk. The text is not
+        # read back, nothing downstream needs it; the file size (UTF-8 bytes) stands in for the character count.
+        for text_path in (Path(EXTRACTED_DIR) / f"{safe_name}.txt", Path(OUTPUT_DIR) / f"{safe_name}.txt"):
+            try:
+                size = text_path.stat().st_size
+            except OSError:
+                continue
+            if size > 0:
+                result['char_count'] = size
+                result['status'] = 'success'
+                result['text_file'] = str(text_path)
+                self.logger.info(f"Text already extracted: {text_path}")
+                return result
+
+        # Skip manuals that already failed on a previous run (delete the marker to retry)
+        failure_marker = Path(EXTRACTED_DIR) / f"{safe_name}{FAILURE_MARKER_SUFFIX}"
+        try:
+            previous_error = failure_marker.read_text(encoding='utf-8')
+        except OSError:
+            previous_error = None
+        if previous_error is not None:
+            result['status'] = 'error'
+            result['error'] = f'Failed on a previous run: {previous_error}'
+            self.logger.info(f"Skipping manual that failed previously: {failure_marker}")
+            return result
+
+        self._download_and_extract(url, safe_name, result)
+
+        # Remember the failure so later runs do not retry it on every start
+        if result['status'] == 'error':
+            try:
+                failure_marker.write_text(result['error'], encoding='utf-8')
+            except OSError as e:
+                self.logger.warning(f"Failed to record failure marker {failure_marker}: {e}")
+
+        return result
+
+    def _download_and_extract(self, url: str, safe_name: str, result: Dict):
+        """Download the PDF of a manual and extract its text, filling in the result."""
         # Download PDF
         pdf_path = self.download_pdf(url, safe_name)
         if not pdf_path:
             result['status'] = 'error'
             result['error'] = 'Failed to download PDF'
-            return result
+            return
 
         # Extract text
         try:
@@ -235,6 +350,7 @@ class ManualProcessor:
 
                 result['status'] = 'success'
                 result['text'] = text
+                result['char_count'] = len(text)
                 result['text_file'] = str(text_path)
                 self.logger.info(f"Successfully extracted text: {len(text)} characters")
             else:
@@ -244,24 +360,23 @@ class ManualProcessor:
         except Exception as e:
             result['status'] = 'error'
             result['error'] = f'Text extraction failed: {str(e)}'
-            self.logger.error(f"Text extraction failed for {name}: {e}")
-
-        return result
+            self.logger.error(f"Text extraction failed for {result['name']}: {e}")
 
     def process_all_manuals(self, network_devices_data: List[Dict]) -> List[Dict]:
-        """Process all manuals in the dataset."""
-        results = []
+        """Process all manuals in the dataset, downloading them in parallel."""
         total = len(network_devices_data)
+        results: List[Optional[Dict]] = [None] * total
 
         self.logger.info(f"Starting processing of {total} manuals...")
 
-        for i, manual in enumerate(network_devices_data, 1):
-            self.logger.info(f"\n--- Processing {i}/{total} ---")
-            result = self.process_manual(manual)
-            results.append(result)
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+            futures = {executor.submit(self.process_manual, manual): i
+                       for i, manual in enumerate(network_devices_data)}
 
-            # Small delay to be respectful to servers
-            time.sleep(1)
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                self.logger.info(f"--- Processed {done}/{total}: {results[i]['name']} ({results[i]['status']}) ---")
 
         return results
 
@@ -301,23 +416,15 @@ class ManualProcessor:
         output_path = Path(data_dir)
         if not output_path.exists(): return False
 
-        # Check if there are any .txt files in the output directory
-        txt_files = list(output_path.glob("*.txt"))
-        return len(txt_files) > 0
+        # Check if there is at least one .txt file in the output directory, stopping at the first hit
+        with os.scandir(output_path) as entries:
+            return any(entry.name.endswith('.txt') for entry in entries)
 
 
     def _extract_manuals_data(self) -> bool:
 
-        self.logger.info("Checking if extracted data exists...")
-
-        # Check if extracted data already exists
-        if self._check_data_exists(EXTRACTED_DIR):
-            self.logger.info(f"Extracted data found in '{EXTRACTED_DIR}' directory")
-            return True
-
-        self.logger.info(f"No extracted data found in '{EXTRACTED_DIR}' directory. Starting download and extraction process...")
-
-        # Initialize processor
+        # Manuals whose text is already extracted, or that failed on a previous run, are skipped
+        # one by one in process_manual, so a restart only downloads manuals never attempted before
         self.logger.info(f"Will process {len(self.devices)} manuals")
 
         try:
@@ -328,7 +435,7 @@ class ManualProcessor:
 
             successful_results = [r for r in results if r['status'] == 'success']
             if successful_results:
-                total_chars = sum(len(r.get('text', '')) for r in successful_results)
+                total_chars = sum(r['char_count'] for r in successful_results)
                 avg_chars = total_chars // len(successful_results) if successful_results else 0
                 self.logger.info(f"Text extraction statistics:")
                 self.logger.info(f"  Total characters extracted: {total_chars:,}")
@@ -357,11 +464,8 @@ class ManualProcessor:
             self.logger.warning(f"No extracted data found in '{EXTRACTED_DIR}' directory. Skipping processing.")
             return True
 
-        # Check if the data was already processed
-        if self._check_data_exists(OUTPUT_DIR):
-            self.logger.info(f"Processed data found in '{OUTPUT_DIR}' directory. Skipping processing.")
-            return True
-
+        # Files already processed are skipped one by one in TextPostProcessor.process_text_file
+        # (output newer than source), so newly extracted manuals still get cleaned
         try:
 
             extracted_files = list(Path(EXTRACTED_DIR).glob("*.txt"))
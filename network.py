@@ -1,6 +1,9 @@
-import json
 import logging
-from typing import Dict, List
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import orjson
 
 from manual_processor import ManualProcessor
 
@@ -8,6 +11,17 @@ NETWORK_DEVICES_SRC = './network_devices.json'
 NETWORK_TOPOLOGY_SRC = './network_topology.json'
 
 
+@lru_cache(maxsize=32)
+def _read_json(path: str, mtime_ns: int) -> Optional[object]:
+    """Parse a JSON file, memoized on (path, mtime) so every Network instance shares one parse.
+    Returns None if the file is empty. The result is shared: callers must not mutate it."""
+    with open(path, 'rb') as f:
+        content = f.read().strip()
+    if not content:
+        return None
+    return orjson.loads(content)
+
+
 class Network:
     def __init__(self, devices_src: str = NETWORK_DEVICES_SRC, topology_src: str = NETWORK_TOPOLOGY_SRC):
         # Initialize logger FIRST
@@ -17,6 +31,7 @@ class Network:
         self.topology_src = topology_src
         self.devices = self._load_devices()
         self.topology = self._load_topology()
+        self._filtered_devices: Optional[List[Dict]] = None
 
         self.logger.info("Network instance created with devices and topology loaded.")
 
@@ -26,16 +41,15 @@ class Network:
     def _load_devices(self) -> List[Dict]:
         """Load network devices from the JSON source."""
         try:
-            with open(self.devices_src, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:
-                    self.logger.warning(f"Devices file {self.devices_src} is empty")
-                    return []
-                return json.loads(content)
+            content = _read_json(self.devices_src, os.stat(self.devices_src).st_mtime_ns)
+            if content is None:
+                self.logger.warning(f"Devices file {self.devices_src} is empty")
+                return []
+            return content
         except FileNotFoundError:
             self.logger.error(f"Devices file not found: {self.devices_src}")
             return []
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON in devices file {self.devices_src}: {e}")
             return []
         except Exception as e:
@@ -45,16 +59,15 @@ class Network:
     def _load_topology(self) -> Dict:
         """Load network topology from the JSON source."""
         try:
-            with open(self.topology_src, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:
-                    self.logger.warning(f"Topology file {self.topology_src} is empty")
-                    return {"topology": {"nodes": [], "connections": []}}
-                return json.loads(content)
+            content = _read_json(self.topology_src, os.stat(self.topology_src).st_mtime_ns)
+            if content is None:
+                self.logger.warning(f"Topology file {self.topology_src} is empty")
+                return {"topology": {"nodes": [], "connections": []}}
+            return content
         except FileNotFoundError:
             self.logger.error(f"Topology file not found: {self.topology_src}")
             return {"topology": {"nodes": [], "connections": []}}
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON in topology file {self.topology_src}: {e}")
             return {"topology": {"nodes": [], "connections": []}}
         except Exception as e:
@@ -66,21 +79,15 @@ class Network:
         """Get the list of network devices that are actually used in the topology (no duplicates)."""
         self.logger.debug("Fetching network devices")
 
-        # Extract unique device_ids from topology nodes
-        used_device_ids = set()
-        if self.topology and 'topology' in self.topology:
-            for node in self.topology['topology'].get('nodes', []):
-                if 'device_id' in node:
-                    used_device_ids.add(node['device_id'])
-
-        # Filter devices to only include those used in topology
-        filtered_devices = []
-        for device in self.devices:
-            if device.get('_id') in used_device_ids:
-                filtered_devices.append(device)
+        # The topology does not change after loading, so the filtered list is computed once
+        if self._filtered_devices is None:
+            # Extract unique device_ids from topology nodes
+            nodes = self.topology.get('topology', {}).get('nodes', []) if self.topology else []
+            used_device_ids = {node['device_id'] for node in nodes if 'device_id' in node}
 
-        # Populate manuals for each filtered device
-        for device in filtered_devices:
-            device['manual_text'] = self.manual_processor.get_manual(device)
+            # Filter devices to only include those used in topology
+            self._filtered_devices = [device for device in self.devices if device.get('_id') in used_device_ids]
 
-        return filtered_devices
\ No newline at end of file
+        # Populate manuals for each filtered device (on copies, the loaded devices are shared)
+        get_manual = self.manual_processor.get_manual
+        return [{**device, 'manual_text': get_manual(device)} for device in self._filtered_devices]
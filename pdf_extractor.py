@@ -1,23 +1,131 @@
 import logging
+import mmap
+import os
+import threading
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import Callable, Optional
+
 import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium  # also a dependency of pdfplumber
+
+# PDFium is not thread-safe: no two PDFium calls may run at the same time in one process, even on
+# different documents. Extraction runs in the worker processes when a pool is available (one PDFium
+# per process, each worker runs one task at a time); this lock only serializes the in-process fallback.
+_PDFIUM_LOCK = threading.Lock()
+
+# Documents shorter than this are extracted in-process, a worker pool would cost more than it saves
+MIN_PARALLEL_PAGES = 16
+
+# pdfplumber fast path: follow the content stream order instead of re-clustering characters by position
+PDFPLUMBER_TEXT_OPTIONS = {
+    'x_tolerance': 2,
+    'y_tolerance': 3,
+    'use_text_flow': True,
+    'keep_blank_chars': False,
+}
+
+
+@contextmanager
+def _mapped_pdf(pdf_path: str):
+    """Memory-map a PDF read-only; the mapping is file-like, so the parsers read it without a buffered copy."""
+    with open(pdf_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def _pypdf2_pages_text(pages) -> str:
+    return "".join(page.extract_text() + "\n" for page in pages)
+
+
+def _pdfplumber_pages_text(pages) -> str:
+    chunks = []
+    for page in pages:
+        page_text = page.extract_text(**PDFPLUMBER_TEXT_OPTIONS)
+        if page_text:
+            chunks.append(page_text + "\n")
+    return "".join(chunks)
+
+
+def _pdfium_text(pdf_path: str) -> str:
+    """Worker: extract the text of every page with PDFium."""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        chunks = []
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                chunks.append(textpage.get_text_range())
+            finally:
+                # Release the native buffers as soon as the page is done
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+    return "\n".join(chunks).strip()
+
+
+def _pypdf2_page_range(pdf_path: str, start: int, end: int) -> str:
+    """Worker: extract pages [start, end) with PyPDF2. PDF objects are not picklable, so each worker reopens the file."""
+    with _mapped_pdf(pdf_path) as mapped:
+        reader = PyPDF2.PdfReader(mapped)
+        return _pypdf2_pages_text(reader.pages[start:end])
+
+
+def _pdfplumber_page_range(pdf_path: str, start: int, end: int) -> str:
+    """Worker: extract pages [start, end) with pdfplumber."""
+    with _mapped_pdf(pdf_path) as mapped, pdfplumber.open(mapped) as pdf:
+        return _pdfplumber_pages_text(pdf.pages[start:end])
 
 
 class PDFExtractor:
     """Handles PDF text extraction using multiple methods."""
 
-    def __init__(self):
+    def __init__(self, executor: Optional[Executor] = None, max_workers: Optional[int] = None):
+        """
+        Args:
+            executor (Optional[Executor]): Process pool, owned by the caller, used to run PDFium and to split
+                                           the pages of large PDFs; without one every PDF is extracted in-process
+            max_workers (Optional[int]): Number of page ranges a PDF is split into (default: CPU count)
+        """
         self.logger = logging.getLogger(__name__)
+        self.executor = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _use_pool(self, num_pages: int) -> bool:
+        return self.executor is not None and self.max_workers > 1 and num_pages >= MIN_PARALLEL_PAGES
+
+    def _extract_parallel(self, worker: Callable[[str, int, int], str], pdf_path: str, num_pages: int) -> str:
+        """Extract contiguous page ranges in worker processes and join them in page order."""
+        workers = min(self.max_workers, num_pages)
+        chunk = -(-num_pages // workers)  # ceil division
+        starts = list(range(0, num_pages, chunk))
+        ends = [min(start + chunk, num_pages) for start in starts]
+
+        return "".join(self.executor.map(worker, [pdf_path] * len(starts), starts, ends))
+
+    def extract_with_pdfium(self, pdf_path: str) -> str:
+        """Extract text using PDFium (pypdfium2), in a worker process when a pool is available."""
+        try:
+            if self.executor is not None:
+                return self.executor.submit(_pdfium_text, pdf_path).result()
+            with _PDFIUM_LOCK:
+                return _pdfium_text(pdf_path)
+        except Exception as e:
+            self.logger.error(f"PDFium extraction failed: {e}")
+            return ""
 
     def extract_with_pypdf2(self, pdf_path: str) -> str:
         """Extract text using PyPDF2."""
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
+            with _mapped_pdf(pdf_path) as mapped:
+                reader = PyPDF2.PdfReader(mapped)
+                num_pages = len(reader.pages)
+                if not self._use_pool(num_pages):
+                    return _pypdf2_pages_text(reader.pages).strip()
+
+            return self._extract_parallel(_pypdf2_page_range, pdf_path, num_pages).strip()
         except Exception as e:
             self.logger.error(f"PyPDF2 extraction failed: {e}")
             return ""
@@ -25,21 +133,24 @@ class PDFExtractor:
     def extract_with_pdfplumber(self, pdf_path: str) -> str:
         """Extract text using pdfplumber """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text.strip()
+            with _mapped_pdf(pdf_path) as mapped, pdfplumber.open(mapped) as pdf:
+                num_pages = len(pdf.pages)
+                if not self._use_pool(num_pages):
+                    return _pdfplumber_pages_text(pdf.pages).strip()
+
+            return self._extract_parallel(_pdfplumber_page_range, pdf_path, num_pages).strip()
         except Exception as e:
             self.logger.error(f"pdfplumber extraction failed: {e}")
             return ""
 
     def extract_text(self, pdf_path: str) -> str:
         """Extract text using the best available method."""
-        # Try pdfplumber first (generally better)
-        text = self.extract_with_pdfplumber(pdf_path)
+        # Try PDFium first (fastest)
+        text = self.extract_with_pdfium(pdf_path)
+
+        # Fallback to pdfplumber (generally better than PyPDF2)
+        if not text:
+            text = self.extract_with_pdfplumber(pdf_path)
 
         # Fallback to PyPDF2 if pdfplumber fails or returns empty
         if not text:
@@ -7,6 +7,26 @@ from network import Network
 
 class Router:
 
+    def __init__(self):
+        # Graph and start/end node ids per topology, keyed on id(topology). The topology itself is kept
+        # in the entry so it stays alive and its id cannot be reused by another object.
+        self._graph_cache: Dict[int, Tuple[Dict, Dict[Any, List[Tuple[Any, float]]], Any, Any]] = {}
+
+    def _get_graph(self, topology_data: Dict) -> Tuple[Dict[Any, List[Tuple[Any, float]]], Any, Any]:
+        """Return the graph, starting node id and ending node id for a topology, building them on first use."""
+        cached = self._graph_cache.get(id(topology_data))
+        if cached is None or cached[0] is not topology_data:
+            graph = self.create_graph_from_topology(topology_data)
+
+            # Find the starting node and target node
+            start_id = next((node["id"] for node in topology_data["topology"]["nodes"] if node.get("start")), None)
+            end_id = next((node["id"] for node in topology_data["topology"]["nodes"] if node.get("end")), None)
+
+            cached = (topology_data, graph, start_id, end_id)
+            self._graph_cache[id(topology_data)] = cached
+
+        return cached[1], cached[2], cached[3]
+
     def route_request(self, constraint_devices: List[str], network: Network):
         print("Routing request with constraints:", constraint_devices)
 
@@ -16,21 +36,14 @@ class Router:
         print("Constraint nodes:", constraint_nodes)
 
 
-        # Create a graph from the network topology
-        topology_data = network.topology
-        graph = self.create_graph_from_topology(topology_data)
+        # Get the graph of the network topology (built once per topology)
+        graph, start_id, end_id = self._get_graph(network.topology)
 
         print("Graph created from topology:", graph)
 
-        # Create a reverse graph
-        reverse_graph = self.create_reverse_graph(graph)
-        print("Reverse graph created:", reverse_graph)
-
-
-        # Find the starting node and target node
-
-        start_id = next((node["id"] for node in topology_data["topology"]["nodes"] if node.get("start")), None)
-        end_id = next((node["id"] for node in topology_data["topology"]["nodes"] if node.get("end")), None)
+        # The topology graph is undirected (every connection is added in both
+        # directions), so it is its own reverse graph
+        reverse_graph = graph
 
         print("Starting id:", start_id)
         print("Ending id:", end_id)
@@ -116,31 +129,35 @@ class Router:
                   lists of their predecessors on a shortest path from the 'source'.
         """
 
-        dist = {node: float('inf') for node in graph}
+        dist = dict.fromkeys(graph, float('inf'))
         preds = {node: [] for node in graph}
         dist[source] = 0
 
+        # Bind the heap operations locally, they run once per edge relaxation
+        heappush, heappop = heapq.heappush, heapq.heappop
+
         # Priority queue
         heap = [(0, source)]
 
         while heap:
             # Extract the node with the smallest distance.
-            current_dist, u = heapq.heappop(heap)
+            current_dist, u = heappop(heap)
 
             if current_dist > dist[u]: continue
 
             # Explore neighbors of the current node.
             for v, weight in graph[u]:
-                new_dist = dist[u] + weight
+                new_dist = current_dist + weight
+                v_dist = dist[v]
 
                 # If a shorter path to v is found
-                if new_dist < dist[v]:
+                if new_dist < v_dist:
                     dist[v] = new_dist
                     preds[v] = [u]  # Set u as the sole predecessor.
-                    heapq.heappush(heap, (new_dist, v))  # Add v to the heap with its new distance.
+                    heappush(heap, (new_dist, v))  # Add v to the heap with its new distance.
 
                 # If an equally short path to v is found:
-                elif new_dist == dist[v]:
+                elif new_dist == v_dist:
                     preds[v].append(u)  # Add u as an additional predecessor.
 
         return dist, preds
@@ -148,7 +165,9 @@ class Router:
     def enumerate_paths(self, preds: Dict[Any, List[Any]], start: Any, end: Any) -> List[List[Any]]:
         """
         Given a graph of predecessors it generates all possible shortest paths from 'start' to 'end'.
-        Uses a Depth-First Search (DFS) approach to reconstruct all unique shortest paths.
+        Since shortest-path predecessors form a DAG, the paths reaching a node are the paths reaching each of
+        its predecessors extended by the node itself; these are memoized per node, so shared prefixes are
+        built only once.
 
         Args:
             preds (Dict[Any, List[Any]]): A dictionary where keys are nodes and values are lists of their predecessors on a shortest path from the original source of the Dijkstra run.
@@ -159,20 +178,14 @@ class Router:
             List[List[Any]]: A list of paths
         """
 
-        all_paths = []
+        paths_to = {start: [[start]]}
 
-        def dfs(current_node: Any, path: List[Any]):
-            # Base case
-            if current_node == start:
-                all_paths.append(path[::-1])
-                return
+        def build(node: Any) -> List[List[Any]]:
+            if node not in paths_to:
+                paths_to[node] = [path + [node] for p in preds.get(node, ()) for path in build(p)]
+            return paths_to[node]
 
-            if current_node not in preds or not preds[current_node]: return
-            for p in preds[current_node]: dfs(p, path + [p])
-
-        dfs(end, [end])
-
-        return all_paths
+        return build(end)
 
     def constrained_all_shortest_paths(
             self,
@@ -257,15 +270,11 @@ class Router:
                     combined = p1 + p2[1:]  # Slice to avoid duplicating 'c' in the middle of the path.
                     all_valid_paths.append(combined)
 
-        # Remove any duplicate paths that
-        unique_paths = []
-        seen = set()
+        # Remove any duplicate paths, keeping the first occurrence (dicts preserve insertion order)
+        unique_paths = {}
         for p in all_valid_paths:
-            tup = tuple(p)  # Convert list to tuple for set hashing.
-            if tup not in seen:
-                seen.add(tup)
-                unique_paths.append(p)
+            unique_paths.setdefault(tuple(p), p)  # Tuples are hashable, lists are not.
 
-        return best_cost, unique_paths
+        return best_cost, list(unique_paths.values())
 
 
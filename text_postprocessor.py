@@ -1,8 +1,23 @@
 import re
 import logging
+import multiprocessing
+import os
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+
+from log_setup import init_worker_logging
+
+# Bump whenever _clean_text changes its output, so files cleaned by an older version are redone
+CLEANER_VERSION = 2
+
+# Sidecar next to each processed file recording the CLEANER_VERSION that produced it
+CLEANER_VERSION_SUFFIX = '.cleaner'
+
+# Fewer stale files than this are cleaned in-process, starting worker processes would cost more
+MIN_PARALLEL_FILES = 4
 
 class TextPostProcessor:
     def __init__(self, encoding: str = 'utf-8'):
@@ -23,46 +38,76 @@ class TextPostProcessor:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
 
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize text."""
-        if not text:
-            return ""
+        # Single-character cleanups done in one str.translate pass: drop trademark
+        # symbols and fold the bullet variants into '•'
+        self._char_table = str.maketrans({
+            '™': None, '®': None, '©': None,
+            '▪': '•', '▫': '•', '◦': '•', '‣': '•', '⁃': '•',
+        })
+
+        # Cleanup substitutions applied in order by _clean_text, compiled once
+        self._subs = [
+            # Remove excessive whitespace and normalize line breaks
+            (re.compile(r'\s+'), ' '),
+            (re.compile(r'\n\s*\n'), '\n\n'),
 
-        # Remove excessive whitespace and normalize line breaks
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+            # Fix common OCR errors
+            (re.compile(r'(?<=[a-z])(?=[A-Z])'), ' '),  # Add space between camelCase
+            # Space between numbers and letters, and between letters and numbers, in one pass
+            (re.compile(r'(?<=[0-9])(?=[A-Za-z])|(?<=[A-Za-z])(?=[0-9])'), ' '),
 
-        # Fix common OCR errors
-        text = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', text)  # Add space between camelCase
-        text = re.sub(r'([0-9])([A-Za-z])', r'\1 \2', text)  # Space between numbers and letters
-        text = re.sub(r'([A-Za-z])([0-9])', r'\1 \2', text)  # Space between letters and numbers
+            # Clean up bullet points and formatting
+            (re.compile(r'[>•]\s*'), '• '),  # Normalize bullet points
+            (re.compile(r'^\s*[-*]\s+', re.MULTILINE), '• '),  # Convert dashes to bullets
 
-        # Clean up bullet points and formatting
-        text = re.sub(r'[>•▪▫◦‣⁃]\s*', '• ', text)  # Normalize bullet points
-        text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)  # Convert dashes to bullets
+            # Remove page numbers and headers/footers
+            (re.compile(r'\b(?:page|pg\.?)\s*\d+\b', re.IGNORECASE), ''),
+            (re.compile(r'^\d+\s*$', re.MULTILINE), ''),
 
-        # Remove page numbers and headers/footers
-        text = re.sub(r'\b(?:page|pg\.?)\s*\d+\b', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'^\d+\s*$', '', text, flags=re.MULTILINE)
+            # Remove url links
+            (re.compile(r'https?://\S+'), ''),
 
-        # Clean up trademark symbols
-        text = re.sub(r'[™®©]', '', text)
+            # Removed repeted sequences of symbols like '===' or '---'
+            # es: ================================================================================
+            (re.compile(r'[-=.]{3,}'), ''),
 
-        # Remove url links
-        text = re.sub(r'https?://\S+', '', text)
+            # Remove any remaining excessive whitespace (left behind by the removals above)
+            (re.compile(r'\s+'), ' '),
+        ]
 
+    def _clean_text(self, text: str) -> str:
+        """Clean and normalize text."""
+        if not text:
+            return ""
 
-        # Removed repeted sequences of symbols like '===' or '---'
-        # es: ================================================================================
-        text = re.sub(r'[-=.]{3,}', '', text)
+        # Trademark and bullet variants are all non-ASCII, pure ASCII text has none
+        if not text.isascii():
+            text = text.translate(self._char_table)
 
+        for pattern, replacement in self._subs:
+            text = pattern.sub(replacement, text)
 
-        # Remove any remaining excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        return text.strip()
 
+    def _output_path(self, source_path: Path, target_directory: str, preserve_extension: bool = True) -> Path:
+        """Path of the processed version of a source file."""
+        if preserve_extension:
+            output_filename = source_path.name
+        else:
+            output_filename = source_path.stem + '.txt'
+        return Path(target_directory) / output_filename
 
+    def _version_path(self, output_path: Path) -> Path:
+        return output_path.with_name(output_path.name + CLEANER_VERSION_SUFFIX)
 
-        return text.strip()
+    def _is_up_to_date(self, source_path: Path, output_path: Path) -> bool:
+        """Whether the processed file is newer than its source and was cleaned by the current cleaner."""
+        try:
+            if output_path.stat().st_mtime < source_path.stat().st_mtime:
+                return False
+            return self._version_path(output_path).read_text().strip() == str(CLEANER_VERSION)
+        except OSError:
+            return False
 
     def process_text_file(self, source_file: str, target_directory: str,
                           preserve_extension: bool = True) -> bool:
@@ -92,6 +137,13 @@ class TextPostProcessor:
             target_path = Path(target_directory)
             target_path.mkdir(parents=True, exist_ok=True)
 
+            output_path = self._output_path(source_path, target_directory, preserve_extension)
+
+            # Skip files whose cleaned version is already up to date
+            if self._is_up_to_date(source_path, output_path):
+                self.logger.info(f"Processed file is up to date, skipping: {output_path}")
+                return True
+
             # Read source file
             self.logger.info(f"Reading source file: {source_file}")
             with open(source_path, 'r', encoding=self.encoding) as file:
@@ -101,18 +153,11 @@ class TextPostProcessor:
             self.logger.info("Processing text content...")
             cleaned_text = self._clean_text(text_content)
 
-            # Determine output filename
-            if preserve_extension:
-                output_filename = source_path.name
-            else:
-                output_filename = source_path.stem + '.txt'
-
-            output_path = target_path / output_filename
-
             # Write processed text to target file
             self.logger.info(f"Writing processed text to: {output_path}")
             with open(output_path, 'w', encoding=self.encoding) as file:
                 file.write(cleaned_text)
+            self._version_path(output_path).write_text(str(CLEANER_VERSION))
 
             self.logger.info(f"Successfully processed {source_file} -> {output_path}")
             return True
@@ -127,27 +172,41 @@ class TextPostProcessor:
             self.logger.error(f"Unexpected error processing {source_file}: {e}")
             return False
 
-    def process_multiple_files(self, source_files: list, target_directory: str) -> Dict[str, bool]:
+    def process_multiple_files(self, source_files: list, target_directory: str,
+                               max_workers: Optional[int] = None) -> Dict[str, bool]:
         """
-        Process multiple text files.
+        Process multiple text files, skipping those already up to date and cleaning the
+        rest in parallel across CPU cores.
 
         Args:
             source_files (list): List of source file paths
             target_directory (str): Directory where processed files will be saved
+            max_workers (Optional[int]): Number of worker processes (default: CPU count)
 
         Returns:
             Dict[str, bool]: Dictionary mapping source files to success status
         """
-        results = {}
-
         self.logger.info(f"Processing {len(source_files)} files...")
 
-        for source_file in source_files:
-            success = self.process_text_file(source_file, target_directory)
-            results[source_file] = success
+        # Check freshness here, so workers are only started for files that actually need cleaning
+        results = dict.fromkeys(source_files, True)
+        stale_files = [source_file for source_file in source_files
+                       if not self._is_up_to_date(Path(source_file), self._output_path(Path(source_file), target_directory))]
+        self.logger.info(f"{len(source_files) - len(stale_files)} files already up to date")
+
+        if len(stale_files) < MIN_PARALLEL_FILES:
+            # Too few files to be worth starting worker processes
+            for source_file in stale_files:
+                results[source_file] = self.process_text_file(source_file, target_directory)
+        else:
+            workers = min(max_workers or os.cpu_count() or 1, len(stale_files))
+            process_file = partial(self.process_text_file, target_directory=target_directory)
+            # Spawned (not forked) workers, as the parent runs threads such as the log listener
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=init_worker_logging) as executor:
+                results.update(zip(stale_files, executor.map(process_file, stale_files, chunksize=4)))
 
         successful = sum(results.values())
         self.logger.info(f"Processing complete: {successful}/{len(source_files)} files successful")
 
         return results
-